@@ -0,0 +1,293 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import numpy as np
+from game_stats import League, ANALYTICS_VERSION
+
+META_FILE = "analytics.pkl"
+SOURCES_FILE = "sources.json"
+INT_ARRAYS_FILE = "ints.npy"
+FLOAT_ARRAYS_FILE = "floats.npy"
+TMP_PREFIX = ".tmp-"
+# Temporary directories untouched for this long belong to a dead writer
+STALE_TMP_SECONDS = 10 * 60
+
+
+@dataclass(frozen=True)
+class _ArrayRef:
+    """Placeholder for a numeric list stored in one of the entry's arrays."""
+    kind: str  # "int" or "float"
+    offset: int
+    length: int
+
+
+def compute_league_analytics(league: League) -> Dict:
+    """Compute everything the reports and notebook need from a league."""
+    return {
+        "league_statistics": league.get_league_statistics(),
+        "match_summaries": [match.get_match_summary() for match in league.matches],
+        "round_statistics": [league.get_round_statistics(i) for i in range(len(league.rounds))],
+        "score_histories": {name: p.score_history for name, p in league.players.items()},
+        "move_distributions": {name: p.move_value_distribution for name, p in league.players.items()},
+        "score_progressions": [match.score_progression for match in league.matches]
+    }
+
+
+def _hash_file(path: str) -> str:
+    """Return the SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode(obj: Any, ints: List[int], floats: List[float]) -> Any:
+    """Move numeric lists out of `obj` into flat buffers, leaving references."""
+    if isinstance(obj, dict):
+        return {k: _encode(v, ints, floats) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return tuple(_encode(v, ints, floats) for v in obj)
+    if isinstance(obj, list):
+        if obj and all(type(v) is int for v in obj):
+            ref = _ArrayRef("int", len(ints), len(obj))
+            ints.extend(obj)
+            return ref
+        if obj and all(type(v) in (int, float) for v in obj):
+            ref = _ArrayRef("float", len(floats), len(obj))
+            floats.extend(obj)
+            return ref
+        return [_encode(v, ints, floats) for v in obj]
+    return obj
+
+
+def _decode(obj: Any, arrays: Dict[str, np.ndarray]) -> Any:
+    """Replace array references with views into the memory-mapped arrays."""
+    if isinstance(obj, _ArrayRef):
+        return arrays[obj.kind][obj.offset:obj.offset + obj.length]
+    if isinstance(obj, dict):
+        return {k: _decode(v, arrays) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return tuple(_decode(v, arrays) for v in obj)
+    if isinstance(obj, list):
+        return [_decode(v, arrays) for v in obj]
+    return obj
+
+
+class AnalyticsCache:
+    """Content-addressed on-disk cache of computed league analytics.
+
+    Entries are keyed by a hash of the input files' contents, in the order
+    given, and ANALYTICS_VERSION. Each entry is a directory holding a
+    pickled summary plus the numeric lists (score histories,
+    progressions...) packed into .npy files that are memory-mapped on load,
+    so cached series come back as read-only numpy arrays. The cache is
+    bounded by `max_bytes` and evicts the least recently used entries first.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024):
+        """Initialize the cache with an optional directory and size bound."""
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(__file__), '.analytics_cache')
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key_for(self, input_paths: Sequence[str]) -> str:
+        """Return the cache key for a list of input files.
+
+        Order matters: the league is built in input order, so the same files
+        in another order produce different match lists and a different key.
+        """
+        digest = hashlib.sha256(f"analytics-v{ANALYTICS_VERSION}".encode())
+        for path in input_paths:
+            digest.update(_hash_file(path).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Load a cached entry, or return None if it is missing or unreadable."""
+        entry_dir = os.path.join(self.cache_dir, key)
+        meta_path = os.path.join(entry_dir, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        try:
+            with open(meta_path, 'rb') as f:
+                meta = pickle.load(f)
+            lengths = meta["array_lengths"]
+            arrays = {
+                "int": self._load_array(os.path.join(entry_dir, INT_ARRAYS_FILE), lengths["int"]),
+                "float": self._load_array(os.path.join(entry_dir, FLOAT_ARRAYS_FILE), lengths["float"])
+            }
+            analytics = _decode(meta["analytics"], arrays)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(meta_path)
+        except FileNotFoundError as e:
+            if not os.path.exists(meta_path):
+                # Evicted by another process while we were reading it
+                return None
+            print(f"Error loading cached analytics {key}: {e}")
+            self._remove(key)
+            return None
+        except (OSError, ValueError, EOFError, KeyError, AttributeError, pickle.UnpicklingError) as e:
+            print(f"Error loading cached analytics {key}: {e}")
+            self._remove(key)
+            return None
+        return analytics
+
+    def put(self, key: str, analytics: Dict, input_paths: Sequence[str] = ()) -> None:
+        """Store an entry, replacing older entries built from the same files."""
+        ints, floats = [], []
+        encoded = _encode(analytics, ints, floats)
+
+        sources = [os.path.abspath(p) for p in input_paths]
+
+        entry_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = tempfile.mkdtemp(prefix=TMP_PREFIX, dir=self.cache_dir)
+        try:
+            with open(os.path.join(tmp_dir, META_FILE), 'wb') as f:
+                meta = {
+                    "analytics": encoded,
+                    "array_lengths": {"int": len(ints), "float": len(floats)}
+                }
+                pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+            if ints:
+                np.save(os.path.join(tmp_dir, INT_ARRAYS_FILE), np.asarray(ints, dtype=np.int64))
+            if floats:
+                np.save(os.path.join(tmp_dir, FLOAT_ARRAYS_FILE), np.asarray(floats, dtype=np.float64))
+            with open(os.path.join(tmp_dir, SOURCES_FILE), 'w') as f:
+                json.dump(sources, f)
+
+            self._remove(key)
+            try:
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                # Another writer stored the same entry first; keep theirs
+                if not os.path.exists(os.path.join(entry_dir, META_FILE)):
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        if sources:
+            self._invalidate_sources(sources, keep=key)
+        self.evict()
+
+    def get_or_compute(self, input_paths: Sequence[str], compute: Callable[[], Dict]) -> Dict:
+        """Return cached analytics for the inputs, computing and storing them on a miss."""
+        key = self.key_for(input_paths)
+        analytics = self.get(key)
+        if analytics is None:
+            analytics = compute()
+            try:
+                self.put(key, analytics, input_paths)
+            except OSError as e:
+                # A cache that cannot be written is just a cache miss
+                print(f"Error storing cached analytics {key}: {e}")
+                return analytics
+            # Reload so hits and misses return the same array-backed shape
+            analytics = self.get(key) or analytics
+        return analytics
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes.
+
+        Stale temporary directories left by interrupted writes are removed
+        first; ones still being written count towards the total.
+        """
+        total = self._clean_temp_dirs()
+        entries = self._entries()
+        total += sum(size for _, _, size in entries)
+        remaining = len(entries)
+        for key, _, size in sorted(entries, key=lambda e: e[1]):
+            # Always keep the most recent entry, even if it alone is too big
+            if total <= self.max_bytes or remaining <= 1:
+                break
+            self._remove(key)
+            total -= size
+            remaining -= 1
+
+    def clear(self) -> None:
+        """Remove every cached entry and any stale temporary directory."""
+        self._clean_temp_dirs()
+        for key, _, _ in self._entries():
+            self._remove(key)
+
+    def _entries(self) -> List[Tuple[str, float, int]]:
+        """Return (key, last access time, size in bytes) for each entry."""
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            if key.startswith(TMP_PREFIX):
+                continue
+            try:
+                last_used = os.path.getmtime(os.path.join(self.cache_dir, key, META_FILE))
+                size = self._dir_size(os.path.join(self.cache_dir, key))
+            except OSError:
+                # Not an entry, or removed by another process meanwhile
+                continue
+            entries.append((key, last_used, size))
+        return entries
+
+    def _clean_temp_dirs(self) -> int:
+        """Remove stale temporary directories; return the size of the live ones."""
+        live_size = 0
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.startswith(TMP_PREFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if now - os.path.getmtime(path) > STALE_TMP_SECONDS:
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    live_size += self._dir_size(path)
+            except OSError:
+                continue
+        return live_size
+
+    def _invalidate_sources(self, sources: List[str], keep: str) -> None:
+        """Drop entries computed from the same files, in the same order, as `keep`."""
+        for key, _, _ in self._entries():
+            if key == keep:
+                continue
+            try:
+                with open(os.path.join(self.cache_dir, key, SOURCES_FILE), 'r') as f:
+                    if json.load(f) == sources:
+                        self._remove(key)
+            except (OSError, json.JSONDecodeError):
+                continue
+
+    def _remove(self, key: str) -> None:
+        """Delete an entry from disk."""
+        shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        """Total size in bytes of the files directly inside `path`."""
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+    @staticmethod
+    def _load_array(path: str, length: int) -> np.ndarray:
+        """Memory-map a packed array file, checking it holds `length` values."""
+        if length == 0:
+            return np.empty(0)
+        array = np.load(path, mmap_mode='r')
+        if array.shape != (length,):
+            raise ValueError(f"{os.path.basename(path)} holds {array.shape} values, expected {length}")
+        return array
+
+
+def load_league_analytics(input_paths: Sequence[str],
+                          build_league: Callable[[Sequence[str]], League],
+                          cache: Optional[AnalyticsCache] = None) -> Dict:
+    """Return league analytics for the input files, rebuilding the league only on a cache miss."""
+    cache = cache or AnalyticsCache()
+    return cache.get_or_compute(
+        input_paths,
+        lambda: compute_league_analytics(build_league(input_paths))
+    )
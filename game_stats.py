@@ -10,6 +10,10 @@ from dataclasses import dataclass, asdict
 import pandas as pd
 from board import Board, Move, Direction
 
+# Bump whenever the output of the analytics below changes, so that cached
+# results computed by an older version are not reused.
+ANALYTICS_VERSION = 1
+
 class Player:
     """Tracks statistics for an individual player."""
     
@@ -335,6 +339,7 @@ class League:
         self.players = {}  # name -> Player
         self.matches = []  # List of Match objects
         self.rounds = []  # List of lists of matches
+        self.byes = {}  # round index -> name of the player sitting out
     
     def add_player(self, name: str) -> Player:
         """Add a player to the league."""
@@ -365,6 +370,13 @@ class League:
             self.start_new_round()
         self.rounds[-1].append(match)
     
+    def record_bye(self, player_name: str):
+        """Record that a player receives a bye in the current round."""
+        if not self.rounds:
+            self.start_new_round()
+        self.add_player(player_name)
+        self.byes[len(self.rounds) - 1] = player_name
+    
     def get_league_statistics(self) -> Dict:
         """Calculate statistics across the entire league."""
         if not self.players:
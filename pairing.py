@@ -0,0 +1,784 @@
+from typing import Callable, Dict, Iterable, List, Tuple, Optional, Set
+from collections import defaultdict
+from dataclasses import dataclass, field
+import random
+import time
+from game_stats import League
+
+# Fields up to this size are matched on the complete graph
+DENSE_FIELD_SIZE = 64
+
+
+@dataclass
+class Standing:
+    """A player's position in the league table."""
+    name: str
+    points: float
+    spread: int
+    byes: int
+
+
+@dataclass
+class RoundPairings:
+    """Pairings produced for a single round."""
+    pairings: List[Tuple[str, str]]
+    bye: Optional[str] = None
+    rematches: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class _PairingCosts:
+    """Pairing penalties for a standings-ordered field.
+
+    Costs are integers in three tiers, each outweighing any round total of
+    the tiers below: a rematch (or a bye for someone who already has more
+    byes than others); crossing score groups, by squared group distance;
+    and rank terms. Within a group the rank term pulls each pair towards
+    the Dutch counterpart half a group away; across groups it makes the
+    floater the lowest player of the upper group and its opponent the
+    highest of the lower one.
+    """
+
+    def __init__(self, standings: List[Standing], played: List[Set[int]]):
+        n = len(standings)
+        self.num_players = n
+        self.played = played
+        self.byes = [s.byes for s in standings]
+
+        self.group_of = []
+        self.group_start = []
+        sizes = []
+        previous = None
+        for position, s in enumerate(standings):
+            if s.points != previous:
+                sizes.append(0)
+                self.group_start.append(position)
+                previous = s.points
+            self.group_of.append(len(sizes) - 1)
+            sizes[-1] += 1
+        self.group_end = [start + size - 1 for start, size in zip(self.group_start, sizes)]
+        self.half = [max(size // 2, 1) for size in sizes]
+        self.last_group = len(sizes) - 1
+
+        # A rank term never exceeds 2n per pair, so these bounds hold per round
+        self.min_byes = min(self.byes, default=0)
+        max_rank_cost = 2 * n
+        self.group_penalty = (n // 2 + 1) * max_rank_cost + 1
+        max_soft_cost = self.group_penalty * self.last_group ** 2 + max_rank_cost
+        self.rematch_penalty = (n // 2 + 1) * max_soft_cost + 1
+        max_extra_byes = max(self.byes, default=0) - self.min_byes
+        self.top = self.rematch_penalty * (max_extra_byes + 2) + max_soft_cost
+
+        self.bye_vertex = n if n % 2 == 1 else None
+        self.num_vertices = n + 1 if n % 2 == 1 else n
+        self._free_neighbours = {}
+
+    def cost(self, i: int, j: int) -> int:
+        """Cost of pairing the players at standings positions i < j."""
+        upper, lower = self.group_of[i], self.group_of[j]
+        group_distance = lower - upper
+        cost = self.group_penalty * group_distance * group_distance
+        if group_distance == 0:
+            cost += abs(j - i - self.half[upper])
+        else:
+            cost += (self.group_end[upper] - i) + (j - self.group_start[lower])
+        if j in self.played[i]:
+            cost += self.rematch_penalty
+        return cost
+
+    def bye_cost(self, i: int) -> int:
+        """Cost of giving the bye to the player at standings position i."""
+        group_distance = self.last_group - self.group_of[i]
+        return (self.rematch_penalty * (self.byes[i] - self.min_byes) +
+                self.group_penalty * group_distance * group_distance +
+                self.num_players - 1 - i)
+
+    def free_neighbours(self, v: int) -> List[int]:
+        """Vertices v can be matched with at no rematch or repeat-bye penalty."""
+        if v not in self._free_neighbours:
+            n = self.num_players
+            if v == self.bye_vertex:
+                found = [i for i in range(n) if self.byes[i] == self.min_byes]
+            else:
+                played = self.played[v]
+                found = [u for u in range(n) if u != v and u not in played]
+                if self.bye_vertex is not None and self.byes[v] == self.min_byes:
+                    found.append(self.bye_vertex)
+            self._free_neighbours[v] = found
+        return self._free_neighbours[v]
+
+
+class PairingEngine:
+    """Swiss-style pairing engine driven by the history stored in a League.
+
+    Players are ordered by standings and split into score groups. Each round
+    is paired by a minimum-cost perfect matching where a rematch costs more
+    than every other penalty combined, pairing across score groups costs
+    more than all rank preferences combined, and within a group the Dutch
+    pairing (top half against bottom half) is free. Floaters are taken from
+    the bottom of their group and meet the top of the next. With an odd
+    field a virtual bye opponent joins the matching, so the bye goes to the
+    lowest-ranked player with the fewest byes whenever that keeps the rest
+    rematch-free.
+    """
+
+    def __init__(self, league: League, bye_points: float = 1.0, neighbours: int = 8):
+        self.league = league
+        self.bye_points = bye_points
+        # Candidate opponents per player in the sparse graph used for large fields
+        self.neighbours = neighbours
+
+    def get_played_opponents(self) -> Dict[str, Set[str]]:
+        """Return, for each player, the set of opponents already faced."""
+        played = defaultdict(set)
+        for round_matches in self.league.rounds:
+            for match in round_matches:
+                played[match.player1.name].add(match.player2.name)
+                played[match.player2.name].add(match.player1.name)
+        return played
+
+    def get_bye_counts(self) -> Dict[str, int]:
+        """Return how many byes each player has received so far."""
+        counts = defaultdict(int)
+        for name in self.league.byes.values():
+            counts[name] += 1
+        return counts
+
+    def get_standings(self) -> List[Standing]:
+        """Rank players by points, then spread, then name."""
+        points = defaultdict(float)
+        spread = defaultdict(int)
+        byes = self.get_bye_counts()
+
+        for round_matches in self.league.rounds:
+            for match in round_matches:
+                if not match.is_complete:
+                    continue
+                p1, p2 = match.player1.name, match.player2.name
+                diff = match.final_scores[p1] - match.final_scores[p2]
+                spread[p1] += diff
+                spread[p2] -= diff
+                if diff > 0:
+                    points[p1] += 1
+                elif diff < 0:
+                    points[p2] += 1
+                else:
+                    points[p1] += 0.5
+                    points[p2] += 0.5
+
+        for name, count in byes.items():
+            points[name] += count * self.bye_points
+
+        standings = [
+            Standing(name, points[name], spread[name], byes.get(name, 0))
+            for name in self.league.players
+        ]
+        standings.sort(key=lambda s: (-s.points, -s.spread, s.name))
+        return standings
+
+    def pair_next_round(self, active_players: Optional[List[str]] = None) -> RoundPairings:
+        """Compute pairings for the next round.
+
+        `active_players` restricts the pairing to a subset of the league
+        (e.g. players who confirmed attendance); by default everyone plays.
+        """
+        standings = self.get_standings()
+        if active_players is not None:
+            active = set(active_players)
+            standings = [s for s in standings if s.name in active]
+
+        played = self.get_played_opponents()
+        names = [s.name for s in standings]
+        index = {name: i for i, name in enumerate(names)}
+        played_idx = [
+            {index[o] for o in played.get(name, ()) if o in index}
+            for name in names
+        ]
+        costs = _PairingCosts(standings, played_idx)
+        mate = self._solve(costs)
+
+        bye = None
+        pairings = []
+        rematches = []
+        for i in range(len(names)):
+            j = mate[i]
+            if j == costs.bye_vertex:
+                bye = names[i]
+            elif i < j:
+                pairings.append((names[i], names[j]))
+                if j in played_idx[i]:
+                    rematches.append((names[i], names[j]))
+        return RoundPairings(pairings=pairings, bye=bye, rematches=rematches)
+
+    def apply_pairings(self, round_pairings: RoundPairings) -> List:
+        """Open a new league round and create its matches and bye."""
+        self.league.start_new_round()
+        matches = []
+        for player1_name, player2_name in round_pairings.pairings:
+            match = self.league.create_match(player1_name, player2_name)
+            self.league.add_match_to_current_round(match)
+            matches.append(match)
+        if round_pairings.bye:
+            self.league.record_bye(round_pairings.bye)
+        return matches
+
+    def _solve(self, costs: "_PairingCosts") -> List[int]:
+        """Return the mate of each player in a minimum-cost perfect matching.
+
+        Small fields are matched on the complete graph. Larger ones use a
+        sparse candidate graph (nearby players in the standings and each
+        one's Dutch counterpart) extended with a maximum rematch-free
+        matching and every pair among the players it leaves out. That
+        graph always holds a perfect matching with the fewest possible
+        rematches and repeat byes, so those stay exact; only the
+        within-group preferences are limited to the candidates.
+        """
+        n = costs.num_players
+        if n == 0:
+            return []
+
+        if n <= DENSE_FIELD_SIZE:
+            pairs = {(i, j) for i in range(n) for j in range(i + 1, n)}
+        else:
+            pairs = set()
+            for i in range(n):
+                pairs.update((i, j) for j in self._candidate_opponents(i, costs))
+            pairs.update(self._rematch_free_core(costs))
+
+        edges = [(i, j, costs.top - costs.cost(i, j)) for i, j in pairs if j != costs.bye_vertex]
+        if costs.bye_vertex is not None:
+            edges.extend((i, costs.bye_vertex, costs.top - costs.bye_cost(i)) for i in range(n))
+        return _max_weight_matching(costs.num_vertices, edges)
+
+    def _candidate_opponents(self, i: int, costs: "_PairingCosts") -> List[int]:
+        """Nearby players by rank, the nearest unplayed ones, and the Dutch counterpart."""
+        n = costs.num_players
+        k = self.neighbours
+        candidates = list(range(i + 1, min(n, i + 1 + k)))
+
+        found = 0
+        j = i + 1
+        while j < n and found < k:
+            if j not in costs.played[i]:
+                candidates.append(j)
+                found += 1
+            j += 1
+
+        counterpart = i + costs.half[costs.group_of[i]]
+        candidates.extend(range(max(i + 1, counterpart - k // 2), min(n, counterpart + k // 2 + 1)))
+        return candidates
+
+    @staticmethod
+    def _rematch_free_core(costs: "_PairingCosts") -> Set[Tuple[int, int]]:
+        """Pairs that guarantee a perfect matching with the fewest rematches.
+
+        A maximum matching over penalty-free pairs (unplayed opponents, and
+        the bye for players with the fewest byes) fixes how many penalised
+        pairs are unavoidable; pairing up whoever it leaves out completes it.
+        """
+        mate = _max_cardinality_matching(costs.num_vertices, costs.free_neighbours)
+        core = {(min(v, u), max(v, u)) for v, u in enumerate(mate) if u != -1}
+        left_out = [v for v, u in enumerate(mate) if u == -1]
+        core.update((a, b) for idx, a in enumerate(left_out) for b in left_out[idx + 1:])
+        return core
+
+
+def _max_cardinality_matching(num_vertices: int, neighbours: Callable[[int], Iterable[int]]) -> List[int]:
+    """Maximum-cardinality matching (unweighted Edmonds' blossom algorithm).
+
+    `neighbours(v)` lists the vertices adjacent to v. Starts from a greedy
+    matching and searches one augmenting path per free vertex, contracting
+    odd cycles through a shared base array. Returns the mate of each vertex.
+    """
+    n = num_vertices
+    mate = [-1] * n
+    for v in range(n):
+        if mate[v] == -1:
+            for u in neighbours(v):
+                if mate[u] == -1 and u != v:
+                    mate[v], mate[u] = u, v
+                    break
+
+    def find_augmenting_path(root):
+        used = [False] * n
+        parent = [-1] * n
+        base = list(range(n))
+
+        def lowest_common_base(a, b):
+            seen = [False] * n
+            while True:
+                a = base[a]
+                seen[a] = True
+                if mate[a] == -1:
+                    break
+                a = parent[mate[a]]
+            while True:
+                b = base[b]
+                if seen[b]:
+                    return b
+                b = parent[mate[b]]
+
+        def mark_path(v, b, child, in_blossom):
+            while base[v] != b:
+                in_blossom[base[v]] = in_blossom[base[mate[v]]] = True
+                parent[v] = child
+                child = mate[v]
+                v = parent[mate[v]]
+
+        used[root] = True
+        queue = [root]
+        head = 0
+        while head < len(queue):
+            v = queue[head]
+            head += 1
+            for u in neighbours(v):
+                if base[v] == base[u] or mate[v] == u:
+                    continue
+                if u == root or (mate[u] != -1 and parent[mate[u]] != -1):
+                    # Odd cycle: contract it onto its common base
+                    cycle_base = lowest_common_base(v, u)
+                    in_blossom = [False] * n
+                    mark_path(v, cycle_base, u, in_blossom)
+                    mark_path(u, cycle_base, v, in_blossom)
+                    for i in range(n):
+                        if in_blossom[base[i]]:
+                            base[i] = cycle_base
+                            if not used[i]:
+                                used[i] = True
+                                queue.append(i)
+                elif parent[u] == -1:
+                    parent[u] = v
+                    if mate[u] == -1:
+                        return u, parent
+                    used[mate[u]] = True
+                    queue.append(mate[u])
+        return -1, parent
+
+    for root in range(n):
+        if mate[root] != -1:
+            continue
+        end, parent = find_augmenting_path(root)
+        while end != -1:
+            previous = parent[end]
+            next_end = mate[previous]
+            mate[end], mate[previous] = previous, end
+            end = next_end
+    return mate
+
+
+def _max_weight_matching(num_vertices: int, edges: List[Tuple[int, int, int]]) -> List[int]:
+    """Maximum-weight maximum-cardinality matching (Edmonds' blossom algorithm).
+
+    `edges` holds (i, j, weight) triples with integer weights. Returns the
+    mate of each vertex (-1 if unmatched). This follows the O(n^3)
+    primal-dual formulation by Galil, with blossoms tracked as nested
+    cycles; dual variables are scaled by two so that an edge's slack is
+    dual[i] + dual[j] - 2 * weight.
+    """
+    # Ported from Joris van Rantwijk's mwmatching.py (the reference Python
+    # implementation, also the basis of networkx's max_weight_matching); the
+    # variable names and the four delta types are kept so the two can be
+    # diffed. Changes: snake_case helpers, no assertions, integer weights
+    # only, always maximum-cardinality, and a greedy warm start.
+    mate = [-1] * num_vertices
+    if not edges:
+        return mate
+
+    nvertex = num_vertices
+    nedge = len(edges)
+    max_weight = max(0, max(w for _, _, w in edges))
+    # Endpoint p belongs to edge p // 2; p ^ 1 is the other end of that edge
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * nedge)]
+    neighbend = [[] for _ in range(nvertex)]
+    for k, (i, j, _) in enumerate(edges):
+        neighbend[i].append(2 * k + 1)
+        neighbend[j].append(2 * k)
+
+    # Vertices 0..n-1 are plain vertices, n..2n-1 are blossom ids
+    mate_end = [-1] * nvertex
+    label = [0] * (2 * nvertex)
+    labelend = [-1] * (2 * nvertex)
+    inblossom = list(range(nvertex))
+    blossomparent = [-1] * (2 * nvertex)
+    blossomchilds = [None] * (2 * nvertex)
+    blossombase = list(range(nvertex)) + [-1] * nvertex
+    blossomendps = [None] * (2 * nvertex)
+    bestedge = [-1] * (2 * nvertex)
+    blossombestedges = [None] * (2 * nvertex)
+    unusedblossoms = list(range(nvertex, 2 * nvertex))
+    dualvar = [max_weight] * nvertex + [0] * nvertex
+    allowedge = [False] * nedge
+    queue = []
+
+    def slack(k):
+        i, j, w = edges[k]
+        return dualvar[i] + dualvar[j] - 2 * w
+
+    def blossom_leaves(b):
+        if b < nvertex:
+            yield b
+        else:
+            for t in blossomchilds[b]:
+                if t < nvertex:
+                    yield t
+                else:
+                    yield from blossom_leaves(t)
+
+    def assign_label(w, t, p):
+        b = inblossom[w]
+        label[w] = label[b] = t
+        labelend[w] = labelend[b] = p
+        bestedge[w] = bestedge[b] = -1
+        if t == 1:
+            queue.extend(blossom_leaves(b))
+        elif t == 2:
+            base = blossombase[b]
+            assign_label(endpoint[mate_end[base]], 1, mate_end[base] ^ 1)
+
+    def scan_blossom(v, w):
+        """Trace back from v and w to find a new blossom base, or -1 for an augmenting path."""
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = inblossom[v]
+            if label[b] & 4:
+                base = blossombase[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if labelend[b] == -1:
+                v = -1
+            else:
+                v = endpoint[labelend[b]]
+                b = inblossom[v]
+                v = endpoint[labelend[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        v, w, _ = edges[k]
+        bb = inblossom[base]
+        bv = inblossom[v]
+        bw = inblossom[w]
+        b = unusedblossoms.pop()
+        blossombase[b] = base
+        blossomparent[b] = -1
+        blossomparent[bb] = b
+        blossomchilds[b] = path = []
+        blossomendps[b] = endps = []
+        while bv != bb:
+            blossomparent[bv] = b
+            path.append(bv)
+            endps.append(labelend[bv])
+            v = endpoint[labelend[bv]]
+            bv = inblossom[v]
+        path.append(bb)
+        path.reverse()
+        endps.reverse()
+        endps.append(2 * k)
+        while bw != bb:
+            blossomparent[bw] = b
+            path.append(bw)
+            endps.append(labelend[bw] ^ 1)
+            w = endpoint[labelend[bw]]
+            bw = inblossom[w]
+        label[b] = 1
+        labelend[b] = labelend[bb]
+        dualvar[b] = 0
+        for v in blossom_leaves(b):
+            if label[inblossom[v]] == 2:
+                queue.append(v)
+            inblossom[v] = b
+
+        # Keep, per neighbouring S-blossom, the least-slack edge out of the new blossom
+        bestedgeto = [-1] * (2 * nvertex)
+        for bv in path:
+            if blossombestedges[bv] is None:
+                nblists = [[p // 2 for p in neighbend[v]] for v in blossom_leaves(bv)]
+            else:
+                nblists = [blossombestedges[bv]]
+            for nblist in nblists:
+                for k in nblist:
+                    i, j, _ = edges[k]
+                    if inblossom[j] == b:
+                        i, j = j, i
+                    bj = inblossom[j]
+                    if (bj != b and label[bj] == 1 and
+                            (bestedgeto[bj] == -1 or slack(k) < slack(bestedgeto[bj]))):
+                        bestedgeto[bj] = k
+            blossombestedges[bv] = None
+            bestedge[bv] = -1
+        blossombestedges[b] = [k for k in bestedgeto if k != -1]
+        bestedge[b] = -1
+        for k in blossombestedges[b]:
+            if bestedge[b] == -1 or slack(k) < slack(bestedge[b]):
+                bestedge[b] = k
+
+    def expand_blossom(b, endstage):
+        for s in blossomchilds[b]:
+            blossomparent[s] = -1
+            if s < nvertex:
+                inblossom[s] = s
+            elif endstage and dualvar[s] == 0:
+                expand_blossom(s, endstage)
+            else:
+                for v in blossom_leaves(s):
+                    inblossom[v] = s
+
+        if not endstage and label[b] == 2:
+            # Relabel the even-length path through the expanded T-blossom
+            entrychild = inblossom[endpoint[labelend[b] ^ 1]]
+            j = blossomchilds[b].index(entrychild)
+            if j & 1:
+                j -= len(blossomchilds[b])
+                jstep = 1
+                endptrick = 0
+            else:
+                jstep = -1
+                endptrick = 1
+            p = labelend[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossomendps[b][j - endptrick] ^ endptrick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowedge[blossomendps[b][j - endptrick] // 2] = True
+                j += jstep
+                p = blossomendps[b][j - endptrick] ^ endptrick
+                allowedge[p // 2] = True
+                j += jstep
+            bv = blossomchilds[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            labelend[endpoint[p ^ 1]] = labelend[bv] = p
+            bestedge[bv] = -1
+            j += jstep
+            while blossomchilds[b][j] != entrychild:
+                bv = blossomchilds[b][j]
+                if label[bv] == 1:
+                    j += jstep
+                    continue
+                for v in blossom_leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate_end[blossombase[bv]]]] = 0
+                    assign_label(v, 2, labelend[v])
+                j += jstep
+
+        label[b] = labelend[b] = -1
+        blossomchilds[b] = blossomendps[b] = None
+        blossombase[b] = -1
+        blossombestedges[b] = None
+        bestedge[b] = -1
+        unusedblossoms.append(b)
+
+    def augment_blossom(b, v):
+        """Swap matched/unmatched edges inside blossom b so that v becomes its base."""
+        t = v
+        while blossomparent[t] != b:
+            t = blossomparent[t]
+        if t >= nvertex:
+            augment_blossom(t, v)
+        i = j = blossomchilds[b].index(t)
+        if i & 1:
+            j -= len(blossomchilds[b])
+            jstep = 1
+            endptrick = 0
+        else:
+            jstep = -1
+            endptrick = 1
+        while j != 0:
+            j += jstep
+            t = blossomchilds[b][j]
+            p = blossomendps[b][j - endptrick] ^ endptrick
+            if t >= nvertex:
+                augment_blossom(t, endpoint[p])
+            j += jstep
+            t = blossomchilds[b][j]
+            if t >= nvertex:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate_end[endpoint[p]] = p ^ 1
+            mate_end[endpoint[p ^ 1]] = p
+        blossomchilds[b] = blossomchilds[b][i:] + blossomchilds[b][:i]
+        blossomendps[b] = blossomendps[b][i:] + blossomendps[b][:i]
+        blossombase[b] = blossombase[blossomchilds[b][0]]
+
+    def augment_matching(k):
+        v, w, _ = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = inblossom[s]
+                if bs >= nvertex:
+                    augment_blossom(bs, s)
+                mate_end[s] = p
+                if labelend[bs] == -1:
+                    break
+                t = endpoint[labelend[bs]]
+                bt = inblossom[t]
+                s = endpoint[labelend[bt]]
+                j = endpoint[labelend[bt] ^ 1]
+                if bt >= nvertex:
+                    augment_blossom(bt, j)
+                mate_end[j] = labelend[bt]
+                p = labelend[bt] ^ 1
+
+    # All vertex duals start equal, so every maximum-weight edge is tight and
+    # a greedy matching on those edges is a valid starting point
+    for k, (i, j, w) in enumerate(edges):
+        if w == max_weight and i != j and mate_end[i] == -1 and mate_end[j] == -1:
+            mate_end[i] = 2 * k + 1
+            mate_end[j] = 2 * k
+
+    # Each stage grows alternating trees from all free vertices and either
+    # augments the matching or proves no further augmentation is possible
+    for _ in range(nvertex):
+        label[:] = [0] * (2 * nvertex)
+        bestedge[:] = [-1] * (2 * nvertex)
+        blossombestedges[nvertex:] = [None] * nvertex
+        allowedge[:] = [False] * nedge
+        queue[:] = []
+        for v in range(nvertex):
+            if mate_end[v] == -1 and label[inblossom[v]] == 0:
+                assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbend[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if inblossom[v] == inblossom[w]:
+                        continue
+                    if not allowedge[k]:
+                        kslack = slack(k)
+                        if kslack <= 0:
+                            allowedge[k] = True
+                    if allowedge[k]:
+                        if label[inblossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[inblossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            label[w] = 2
+                            labelend[w] = p ^ 1
+                    elif label[inblossom[w]] == 1:
+                        b = inblossom[v]
+                        if bestedge[b] == -1 or kslack < slack(bestedge[b]):
+                            bestedge[b] = k
+                    elif label[w] == 0:
+                        if bestedge[w] == -1 or kslack < slack(bestedge[w]):
+                            bestedge[w] = k
+            if augmented:
+                break
+
+            # No tight edge left to explore: pick the smallest dual adjustment
+            deltatype = -1
+            delta = deltaedge = deltablossom = None
+            for v in range(nvertex):
+                if label[inblossom[v]] == 0 and bestedge[v] != -1:
+                    d = slack(bestedge[v])
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 2
+                        deltaedge = bestedge[v]
+            for b in range(2 * nvertex):
+                if blossomparent[b] == -1 and label[b] == 1 and bestedge[b] != -1:
+                    d = slack(bestedge[b]) // 2
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 3
+                        deltaedge = bestedge[b]
+            for b in range(nvertex, 2 * nvertex):
+                if (blossombase[b] >= 0 and blossomparent[b] == -1 and label[b] == 2 and
+                        (deltatype == -1 or dualvar[b] < delta)):
+                    delta = dualvar[b]
+                    deltatype = 4
+                    deltablossom = b
+            if deltatype == -1:
+                # Maximum cardinality reached; final update keeps duals valid
+                deltatype = 1
+                delta = max(0, min(dualvar[:nvertex]))
+
+            for v in range(nvertex):
+                if label[inblossom[v]] == 1:
+                    dualvar[v] -= delta
+                elif label[inblossom[v]] == 2:
+                    dualvar[v] += delta
+            for b in range(nvertex, 2 * nvertex):
+                if blossombase[b] >= 0 and blossomparent[b] == -1:
+                    if label[b] == 1:
+                        dualvar[b] += delta
+                    elif label[b] == 2:
+                        dualvar[b] -= delta
+
+            if deltatype == 1:
+                break
+            elif deltatype == 2:
+                allowedge[deltaedge] = True
+                i, j, _ = edges[deltaedge]
+                if label[inblossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif deltatype == 3:
+                allowedge[deltaedge] = True
+                i, j, _ = edges[deltaedge]
+                queue.append(i)
+            else:
+                expand_blossom(deltablossom, False)
+
+        if not augmented:
+            break
+
+        # Expand S-blossoms whose dual dropped to zero so they can be reformed
+        for b in range(nvertex, 2 * nvertex):
+            if (blossomparent[b] == -1 and blossombase[b] >= 0 and
+                    label[b] == 1 and dualvar[b] == 0):
+                expand_blossom(b, True)
+
+    for v in range(nvertex):
+        if mate_end[v] >= 0:
+            mate[v] = endpoint[mate_end[v]]
+    return mate
+
+
+def benchmark_pairing(num_players: int = 500, num_rounds: int = 10,
+                      seed: int = 0) -> Dict:
+    """Simulate a league and time the pairing of each round."""
+    rng = random.Random(seed)
+    league = League("Benchmark League")
+    for i in range(num_players):
+        league.add_player(f"player{i:04d}")
+
+    engine = PairingEngine(league)
+    timings = []
+    rematch_count = 0
+    for _ in range(num_rounds):
+        start = time.perf_counter()
+        round_pairings = engine.pair_next_round()
+        timings.append(time.perf_counter() - start)
+        rematch_count += len(round_pairings.rematches)
+
+        for match in engine.apply_pairings(round_pairings):
+            match.complete_match(rng.randint(250, 500), rng.randint(250, 500))
+
+    return {
+        "players": num_players,
+        "rounds": num_rounds,
+        "max_round_seconds": max(timings),
+        "avg_round_seconds": sum(timings) / len(timings),
+        "rematches": rematch_count
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark_pairing())
+    print(benchmark_pairing(num_players=501))
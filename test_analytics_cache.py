@@ -0,0 +1,216 @@
+import os
+import numpy as np
+import pytest
+import analytics_cache
+from game_stats import League, parse_match_from_text
+from analytics_cache import AnalyticsCache, load_league_analytics
+
+TRANSCRIPT = """(1500)alice (1400)bob
+ 1. H8 WORDS 24 G7 QUIZ 31
+ 2. J4 ZEBRA 40 K3 FOXES 28
+ 3. A1 RETAINS 82 B2 JOKE 19
+____
+146 78
+"""
+
+
+def write_transcript(path, final_line="146 78"):
+    path.write_text(TRANSCRIPT.replace("146 78", final_line))
+    return str(path)
+
+
+def counting_builder():
+    """Return a league builder and the list its calls are recorded in."""
+    calls = []
+
+    def build_league(paths):
+        calls.append(list(paths))
+        league = League("Cache League")
+        league.start_new_round()
+        for path in paths:
+            with open(path) as f:
+                match = parse_match_from_text(f.read(), league)
+            league.add_match_to_current_round(match)
+        return league
+
+    return build_league, calls
+
+
+def test_warm_start_reuses_cached_analytics(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    paths = [write_transcript(tmp_path / "game1.txt")]
+    build_league, calls = counting_builder()
+
+    cold = load_league_analytics(paths, build_league, cache)
+    warm = load_league_analytics(paths, build_league, cache)
+
+    assert len(calls) == 1
+    assert warm["league_statistics"]["match_count"] == 1
+    assert warm["match_summaries"][0]["winner"] == "alice"
+    assert cold["match_summaries"] == warm["match_summaries"]
+
+
+def test_numeric_series_are_memory_mapped(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    paths = [write_transcript(tmp_path / "game1.txt")]
+    build_league, _ = counting_builder()
+
+    analytics = load_league_analytics(paths, build_league, cache)
+    history = analytics["move_distributions"]["alice"]
+
+    assert isinstance(history.base, np.memmap) or isinstance(history, np.memmap)
+    assert list(history) == [24, 40, 82]
+
+
+def test_input_change_invalidates_entry(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    build_league, _ = counting_builder()
+    path = write_transcript(tmp_path / "game1.txt")
+    old_key = cache.key_for([path])
+    load_league_analytics([path], build_league, cache)
+
+    write_transcript(tmp_path / "game1.txt", final_line="100 120")
+    analytics = load_league_analytics([path], build_league, cache)
+
+    assert cache.key_for([path]) != old_key
+    assert cache.get(old_key) is None
+    assert analytics["match_summaries"][0]["winner"] == "bob"
+
+
+def test_input_order_does_not_evict_other_order(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    build_league, calls = counting_builder()
+    first = write_transcript(tmp_path / "game1.txt")
+    second = write_transcript(tmp_path / "game2.txt", final_line="100 120")
+
+    for _ in range(3):
+        load_league_analytics([first, second], build_league, cache)
+        load_league_analytics([second, first], build_league, cache)
+
+    assert calls == [[first, second], [second, first]]
+
+
+def test_lru_eviction_keeps_recently_read_entry(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    build_league, _ = counting_builder()
+    paths = [[write_transcript(tmp_path / f"game{i}.txt", final_line=f"{100 + i} 90")]
+             for i in range(3)]
+    keys = [cache.key_for(p) for p in paths]
+
+    load_league_analytics(paths[0], build_league, cache)
+    load_league_analytics(paths[1], build_league, cache)
+    # Make both entries look old, then read the first one again
+    for age, key in enumerate(keys[:2], start=1):
+        os.utime(os.path.join(cache.cache_dir, key, "analytics.pkl"), (age, age))
+    cache.get(keys[0])
+
+    cache.max_bytes = 2 * max(size for _, _, size in cache._entries()) + 64
+    load_league_analytics(paths[2], build_league, cache)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_corrupt_entry_is_recomputed(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    build_league, _ = counting_builder()
+    paths = [write_transcript(tmp_path / "game1.txt")]
+    load_league_analytics(paths, build_league, cache)
+
+    key = cache.key_for(paths)
+    with open(os.path.join(cache.cache_dir, key, "analytics.pkl"), "wb") as f:
+        f.write(b"not a pickle")
+
+    assert cache.get(key) is None
+    analytics = load_league_analytics(paths, build_league, cache)
+    assert analytics["league_statistics"]["player_count"] == 2
+
+
+def test_missing_array_file_is_a_miss(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    build_league, _ = counting_builder()
+    paths = [write_transcript(tmp_path / "game1.txt")]
+    load_league_analytics(paths, build_league, cache)
+
+    key = cache.key_for(paths)
+    os.remove(os.path.join(cache.cache_dir, key, "ints.npy"))
+
+    assert cache.get(key) is None
+    assert not os.path.exists(os.path.join(cache.cache_dir, key))
+
+
+def test_failed_put_leaves_no_temporary_directory(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+
+    with pytest.raises(OverflowError):
+        cache.put("overflow", {"series": [2 ** 70, 1]})
+
+    assert os.listdir(cache.cache_dir) == []
+
+
+def test_unwritable_cache_still_returns_analytics(tmp_path, monkeypatch):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    build_league, calls = counting_builder()
+    paths = [write_transcript(tmp_path / "game1.txt")]
+
+    def full_disk(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(analytics_cache.np, "save", full_disk)
+    analytics = load_league_analytics(paths, build_league, cache)
+
+    assert len(calls) == 1
+    assert analytics["match_summaries"][0]["winner"] == "alice"
+    assert os.listdir(cache.cache_dir) == []
+
+
+def test_concurrent_put_of_same_entry_succeeds(tmp_path, monkeypatch):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    other = AnalyticsCache(cache.cache_dir)
+    real_replace = analytics_cache.os.replace
+    raced = []
+
+    def replace_after_other_writer(src, dst):
+        # Let another process land the same entry just before our rename
+        if not raced:
+            raced.append(dst)
+            other.put(os.path.basename(dst), {"series": [1, 2, 3]})
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(analytics_cache.os, "replace", replace_after_other_writer)
+    cache.put("shared", {"series": [1, 2, 3]})
+
+    assert list(cache.get("shared")["series"]) == [1, 2, 3]
+    assert os.listdir(cache.cache_dir) == ["shared"]
+
+
+def test_entry_evicted_during_read_is_a_miss(tmp_path, monkeypatch):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    cache.put("gone", {"series": [1, 2, 3]})
+
+    def evicted(path, *args, **kwargs):
+        cache._remove("gone")
+        raise FileNotFoundError(2, "No such file or directory", path)
+
+    monkeypatch.setattr(analytics_cache.os, "utime", evicted)
+    assert cache.get("gone") is None
+
+
+def test_stale_temporary_directories_are_removed(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache"))
+    stale = os.path.join(cache.cache_dir, ".tmp-crashed")
+    fresh = os.path.join(cache.cache_dir, ".tmp-writing")
+    for path in (stale, fresh):
+        os.makedirs(path)
+        with open(os.path.join(path, "analytics.pkl"), "wb") as f:
+            f.write(b"x" * 100)
+    os.utime(stale, (1, 1))
+
+    cache.max_bytes = 50
+    cache.evict()
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+
+    cache.put("entry", {"series": [1, 2, 3]})
+    assert cache.get("entry") is not None
@@ -0,0 +1,145 @@
+import random
+import time
+from collections import Counter
+from functools import lru_cache
+from game_stats import League
+from pairing import PairingEngine, benchmark_pairing
+
+
+def make_league(num_players: int) -> League:
+    league = League("Test League")
+    for i in range(num_players):
+        league.add_player(f"p{i:03d}")
+    return league
+
+
+def play_rounds(league: League, num_rounds: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    engine = PairingEngine(league)
+    results = []
+    for _ in range(num_rounds):
+        round_pairings = engine.pair_next_round()
+        results.append(round_pairings)
+        for match in engine.apply_pairings(round_pairings):
+            match.complete_match(rng.randint(250, 500), rng.randint(250, 500))
+    return results
+
+
+def test_every_player_is_paired_exactly_once():
+    league = make_league(21)
+    round_pairings = PairingEngine(league).pair_next_round()
+
+    seen = [name for pair in round_pairings.pairings for name in pair]
+    seen.append(round_pairings.bye)
+    assert sorted(seen) == sorted(league.players)
+
+
+def test_no_repeat_pairings():
+    league = make_league(40)
+    results = play_rounds(league, 8)
+
+    assert all(not r.rematches for r in results)
+    pairs = [frozenset((m.player1.name, m.player2.name)) for m in league.matches]
+    assert len(pairs) == len(set(pairs))
+
+
+def test_byes_are_balanced():
+    league = make_league(9)
+    play_rounds(league, 9)
+
+    bye_counts = Counter(league.byes.values())
+    assert len(league.byes) == 9
+    assert set(bye_counts.values()) == {1}
+
+
+def test_leaders_are_paired_within_their_score_group():
+    league = make_league(16)
+    play_rounds(league, 1)
+    engine = PairingEngine(league)
+    points = {s.name: s.points for s in engine.get_standings()}
+
+    round_pairings = engine.pair_next_round()
+    for player1, player2 in round_pairings.pairings:
+        assert points[player1] == points[player2]
+
+
+def test_lowest_of_odd_group_floats_to_top_of_next():
+    league = make_league(6)
+    league.start_new_round()
+    for winner, loser in (("p000", "p003"), ("p001", "p005"), ("p002", "p004")):
+        match = league.create_match(winner, loser)
+        league.add_match_to_current_round(match)
+        match.complete_match(350, 300)
+
+    # Groups are [p000, p001, p002] and [p003, p004, p005]
+    round_pairings = PairingEngine(league).pair_next_round()
+    assert ("p002", "p003") in round_pairings.pairings
+    assert ("p000", "p001") in round_pairings.pairings
+
+
+def test_active_players_restrict_the_field():
+    league = make_league(10)
+    active = ["p000", "p001", "p002", "p003"]
+    round_pairings = PairingEngine(league).pair_next_round(active)
+
+    assert sorted(n for pair in round_pairings.pairings for n in pair) == active
+    assert round_pairings.bye is None
+
+
+def test_falls_back_to_rematches_when_unavoidable():
+    league = make_league(2)
+    play_rounds(league, 1)
+
+    round_pairings = PairingEngine(league).pair_next_round()
+    assert len(round_pairings.rematches) == 1
+    assert set(round_pairings.rematches[0]) == {"p000", "p001"}
+
+
+def fewest_possible_rematches(league: League, names: list) -> int:
+    """Exhaustive minimum over all pairings of `names` (even, small fields)."""
+    played = PairingEngine(league).get_played_opponents()
+
+    @lru_cache(maxsize=None)
+    def solve(remaining):
+        if not remaining:
+            return 0
+        first, rest = remaining[0], remaining[1:]
+        return min(
+            (other in played[first]) + solve(rest[:i] + rest[i + 1:])
+            for i, other in enumerate(rest)
+        )
+
+    return solve(tuple(names))
+
+
+def test_rematches_are_minimal():
+    for seed in range(3):
+        league = make_league(12)
+        rng = random.Random(seed)
+        engine = PairingEngine(league)
+        for _ in range(11):
+            round_pairings = engine.pair_next_round()
+            assert len(round_pairings.rematches) == \
+                fewest_possible_rematches(league, sorted(league.players))
+            for match in engine.apply_pairings(round_pairings):
+                match.complete_match(rng.randint(250, 500), rng.randint(250, 500))
+
+
+def test_player_who_faced_everyone_is_paired_quickly():
+    league = make_league(500)
+    league.start_new_round()
+    for name in list(league.players)[1:]:
+        match = league.create_match("p000", name)
+        league.add_match_to_current_round(match)
+        match.complete_match(400, 300)
+
+    start = time.perf_counter()
+    round_pairings = PairingEngine(league).pair_next_round()
+    assert time.perf_counter() - start < 1.0
+    assert len(round_pairings.rematches) == 1
+
+
+def test_benchmark_pairs_500_players_quickly():
+    result = benchmark_pairing(num_players=500, num_rounds=5)
+    assert result["max_round_seconds"] < 1.0
+    assert result["rematches"] == 0